@@ -7,10 +7,31 @@ Created on Tue Aug  5 07:08:28 2025
 @author: WilcoSievers
 """
 
+import os
+import re
+import numbers
+import datetime
+from fnmatch import translate
+from functools import lru_cache
+from collections import defaultdict
+from decimal import Decimal
+from difflib import SequenceMatcher
+
+import numpy
+from openpyxl.utils.cell import get_column_letter
+from openpyxl.utils.exceptions import CellCoordinatesException
+from openpyxl import load_workbook
 from openpyxl.worksheet.worksheet import Worksheet # for type hinting
+from openpyxl.worksheet._read_only import ReadOnlyWorksheet # for type hinting
 from numbers import Number# for type hinting
 
+try:
+    from rapidfuzz import fuzz, process     # C++ scorers, much faster than difflib
+except ImportError:
+    fuzz = process = None;                  # fall back to difflib when rapidfuzz is not installed
 
+
+@lru_cache(maxsize=4096)
 def exc_coord_to_rc(cell_Coord : str) -> (int, int): 
     """
     Converts an Excel cell coordinate (e.g., "A1", "AA10") to (row, column) integers.
@@ -26,18 +47,53 @@ def exc_coord_to_rc(cell_Coord : str) -> (int, int):
     AA33    ->   row = 33   ,  column = 77
     B4      ->   row = 4    ,  column = 2
     BAA501  ->   row = 501  ,  column = 53   
+
+    Absolute references ("$A$1") are accepted, results are cached for repeated coordinates.
     """
-    from openpyxl.utils.cell import coordinate_from_string, column_index_from_string
     # Error/ type handling.
     if not cell_Coord:
         raise ValueError(f"Invalid cell coordinate give: {cell_Coord}")
     if not isinstance(cell_Coord, str):
         raise TypeError(f"excelCordToRC(cell_Coord) requires string type to convert, gave : {type(cell_Coord)} type")
     
-    col_letter, row = coordinate_from_string(cell_Coord);    # get row value
-    col = column_index_from_string(col_letter);              # get column value
+    # parse by hand: optional '$', 1-3 column letters, optional '$', row digits
+    coord = cell_Coord[1:] if cell_Coord[0] == '$' else cell_Coord;
+    col = 0;
+    n_letters = 0;
+    for ch in coord:
+        if 'A' <= ch <= 'Z':
+            col = col*26 + (ord(ch) - 64);      # get column value
+        elif 'a' <= ch <= 'z':
+            col = col*26 + (ord(ch) - 96);
+        else:
+            break;
+        n_letters += 1;
+    row_str = coord[n_letters:];
+    if row_str[:1] == '$':
+        row_str = row_str[1:];
+    if not (1 <= n_letters <= 3) or not row_str.isdecimal():
+        raise CellCoordinatesException(f"Invalid cell coordinates ({cell_Coord})");
+    row = int(row_str);                                      # get row value
+    if row == 0:
+        raise CellCoordinatesException(f"There is no row 0 ({cell_Coord})");
     return row, col;
 
+def _walk_files(path : str):
+    """
+    Recursively yields (name, path) for every file below 'path', using os.scandir DirEntry objects.
+    Mirrors os.walk: symlinked directories are not followed and unreadable directories are skipped.
+    """
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        yield from _walk_files(entry.path);
+                else:
+                    yield entry.name, entry.path;
+    except OSError:
+        return;
+
 def filter_files(path_list:  str | list[str] = ".\\", 
                 pattern: str = "*", 
                 matchPattern: bool = True) -> list[str]:  
@@ -60,21 +116,18 @@ def filter_files(path_list:  str | list[str] = ".\\",
 
         
     """ 
-    import os
-    from fnmatch import fnmatch
-
     results = [];
+    # compile the pattern once, normcase keeps fnmatch's case handling (case-insensitive on Windows)
+    matcher = re.compile(translate(os.path.normcase(pattern))).match;
     
     if isinstance(path_list, str):                                       # if path is str, search for files to path
-        for root, _, files in os.walk(path_list):                        # walk through 
-            for fi in files:
-                full_path = os.path.join(root, fi);
-                if (fnmatch(fi, pattern) == matchPattern):       # if file match pattern then append
-                    results.append(full_path)
+        for fi, full_path in _walk_files(path_list):                     # walk through 
+            if (bool(matcher(os.path.normcase(fi))) == matchPattern):           # if file match pattern then append
+                results.append(full_path)
                     
     elif isinstance(path_list,(list, tuple)):                            # filter iteratible list for relevant patter
         for item in path_list:
-             if (fnmatch(item, pattern) == matchPattern):          # if str matches pattern then append
+             if (bool(matcher(os.path.normcase(item))) == matchPattern):          # if str matches pattern then append
                     results.append(item)
                  
     else:
@@ -83,10 +136,51 @@ def filter_files(path_list:  str | list[str] = ".\\",
     return sorted(results);
 
 
+@lru_cache(maxsize=None)
+def _scorer_scale(scorer) -> float:
+    """
+    Best possible score of a similarity scorer, e.g. 100 for 'rapidfuzz.fuzz.ratio' and 1 for 'JaroWinkler.normalized_similarity'.
+    Probed by scoring two equal and two unrelated strings, which must score 1 or 100 and 0 respectively.
+    """
+    if scorer is None:
+        return 100.0;
+    best_score, worst_score = scorer('abcd', 'abcd'), scorer('abcd', 'wxyz');     # 4 characters, so raw (non normalized) similarities are not 1 or 100
+    if worst_score != 0 or best_score not in (1, 100):
+        raise ValueError(f"Scorer {scorer} is not a 0 - 1 or 0 - 100 similarity scorer (equal strings score {best_score}, "
+                         f"unrelated strings score {worst_score}), use e.g. a 'normalized_similarity' or 'rapidfuzz.fuzz' scorer");
+    return float(best_score);
+
+@lru_cache(maxsize=100_000)
+def _pair_ratio(a : str, b : str, threshold : float = 0.0, scorer = None) -> float:
+    """
+    Similarity ratio (0 - 1) of a single string pair, cached as repeated cell values (headers, labels) are common.
+    Pairs that cannot reach 'threshold' return 0.0 without computing the full ratio.
+    A given 'scorer' is called as scorer(a, b, score_cutoff=...), its score is rescaled to 0 - 1 (see '_scorer_scale').
+    """
+    if scorer is not None:
+        scale = _scorer_scale(scorer);
+        return scorer(a, b, score_cutoff=threshold*scale) / scale;     # the length bound below only holds for ratio scorers
+    len_a, len_b = len(a), len(b);
+    if (len_a + len_b) and (2*min(len_a, len_b) / (len_a + len_b) < threshold):    # length bound, no ratio can exceed it
+        return 0.0;
+    if fuzz is not None:
+        return fuzz.ratio(a, b, score_cutoff=threshold*100) / 100.0;
+    matcher = SequenceMatcher(None, a, b);
+    if (matcher.real_quick_ratio() < threshold) or (matcher.quick_ratio() < threshold):   # cheap upper bounds before the full ratio
+        return 0.0;
+    return matcher.ratio();
+
+def clear_similarity_cache():
+    """
+    Clears the cached string pair similarity ratios used by 'is_similar' and 'search_excl_val'.
+    """
+    _pair_ratio.cache_clear();
+
 def is_similar(target : str = '', 
                test : str | list[str] = '', 
                threshold : float = 0.8, 
-               return_similarrity_score : bool = False) -> bool | tuple[str, float]:
+               return_similarrity_score : bool = False, 
+               scorer = None) -> bool | tuple[str, float]:
     """
     Determine if the given 'test' text is similar to the 'target' text
 
@@ -95,14 +189,15 @@ def is_similar(target : str = '',
         test   = Iteratable of str or list to compare to target
         threshold = Similarity criteria that needs to be adhered to
         return_similarrity_score = Returns the most similar str that overcomes the threshold 
+        scorer = Optional rapidfuzz similarity scorer, called as scorer(a, b, score_cutoff=...), e.g. 'rapidfuzz.fuzz.WRatio' 
+                 or 'rapidfuzz.distance.JaroWinkler.normalized_similarity'. Both 0 - 100 and 0 - 1 scorers are rescaled 
+                 to 0 - 1, the scale is read from the score of two equal strings.
+                 Defaults to 'rapidfuzz.fuzz.ratio' (difflib's ratio if rapidfuzz is not installed).
 
     Returns:
         Bool if value similarity is above 'threshold'
         Most similar value if string is above threshold and 'return_similarrity_score' is 'True'
     """
-    import numpy
-    from difflib import  SequenceMatcher
-    
     # Target value error/ type handling
     if not isinstance(target, str):        # check if target is in string format, 
         try:
@@ -127,29 +222,30 @@ def is_similar(target : str = '',
     
     # Case 1: simple string-to-string comparison
     if isinstance(test, str):                   # return true if string is similar
-        similarity = SequenceMatcher(None, target, test).ratio();
+        similarity = _pair_ratio(target, test, threshold, scorer);
         if return_similarrity_score:
             return (test, similarity) if similarity >= threshold else (None, None);
         return similarity >= threshold;
 
+    # Case 2 & 3: iterable of strings, score the whole batch in one call into a 1xN score vector
+    if process is not None:
+        scale = _scorer_scale(scorer);
+        # no score_cutoff: cdist zeroes scores that land exactly on it, the scalar path keeps them
+        scores = process.cdist([target], test, scorer=fuzz.ratio if scorer is None else scorer, workers=-1, 
+                               dtype=numpy.float64)[0] / scale;
+    else:
+        scores = numpy.array([_pair_ratio(target, s_i, threshold, scorer) for s_i in test], dtype=numpy.float64);
+    mask = scores >= threshold;
+
     # Case 2: iterable of strings and return most similar
     if isinstance(test, (list, numpy.ndarray, tuple)) and return_similarrity_score:
-        valid_str_list = [];
-        valid_str_score = [];
-        
-        for s_i in test:
-            similarity = SequenceMatcher(None, target, s_i).ratio()
-            if (similarity >= threshold):
-                valid_str_list.append(s_i);
-                valid_str_score.append(similarity);
-                
-        if valid_str_list:
-            return numpy.array(valid_str_list), numpy.array(valid_str_score);
+        if mask.any():
+            return numpy.asarray(test)[mask], scores[mask];
         return (None, None)
 
     # Case 3: iterable of strings without return_similarrity_score → return True if any matchopen
     if isinstance(test, (list, tuple, numpy.ndarray)):
-        return any(SequenceMatcher(None, target, s).ratio() >= threshold for s in test)
+        return bool(mask.any())
     
     # Should never reach here
     raise RuntimeError(
@@ -161,21 +257,12 @@ def is_similar(target : str = '',
 
 
 
-def count_significant_digits(number : Number = 1.0):
+_PLAIN_NUMBER = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)");     # plain decimal string, no exponent/ whitespace/ nan
+
+def _count_significant_digits_decimal(number_str : str):
     """
-    Counts the number of significant digits in a number represented as a string.
-    Handles trailing zeros after a decimal point as significant.
+    Decimal based digit count, used by 'count_significant_digits' for strings that are not plain decimals (e.g. "1e-07", "inf").
     """
-    
-    from decimal import Decimal  
-
-    if isinstance(number, Number):       # first try and convert number to str, Python can do this fairly well with no problem.
-        number_str = str(number);
-    elif not isinstance(number, str):           # if not number, convert water the data type, catch the error
-        number_str = str(number);
-    else:
-        number_str = number;
-
     float(number_str); # try cinverting values, if number contains number then a value error will be raised
     
     d = Decimal(number_str)
@@ -192,136 +279,394 @@ def count_significant_digits(number : Number = 1.0):
     
     return len(normalized_str.replace('.', '').replace('-', '')) # Remove decimal point and sign for counting
 
-def search_excl_val(sheet : Worksheet, 
+@lru_cache(maxsize=1024, typed=True)     # typed, 1 and 1.0 have different digit counts
+def count_significant_digits(number : Number = 1.0):
+    """
+    Counts the number of significant digits in a number represented as a string.
+    Handles trailing zeros after a decimal point as significant.
+    Results are cached, repeated search targets are not recounted.
+
+    Plain decimal strings are counted directly from their digits, without building a Decimal. 
+    The count matches the length of the normalised Decimal string, including its 'E+n' part for whole numbers 
+    ending in zeros (e.g. 100 -> "1E+2" -> 4).
+    """
+
+    if isinstance(number, Number):       # first try and convert number to str, Python can do this fairly well with no problem.
+        number_str = str(number);
+    elif not isinstance(number, str):           # if not number, convert water the data type, catch the error
+        number_str = str(number);
+    else:
+        number_str = number;
+
+    if _PLAIN_NUMBER.fullmatch(number_str) is None:
+        return _count_significant_digits_decimal(number_str);
+
+    # split into digits and exponent, as Decimal would store them
+    is_negative = number_str[0] == '-';
+    int_part, _, frac_part = number_str.lstrip('+-').partition('.');
+    digits = (int_part + frac_part).lstrip('0');
+    if not digits:
+        return 1;                                        # any zero normalises to "0"
+    exponent = len(digits) - len(digits.rstrip('0')) - len(frac_part);
+    digits = digits.rstrip('0');
+    n_digits = len(digits);
+    adjusted = exponent + n_digits - 1;
+
+    # length of str(Decimal.normalize()) without '.' and '-', and the number of '-' signs it holds
+    if exponent <= 0 and adjusted >= -6:                 # plain notation, e.g. "12.5" or "0.0012"
+        left_digits = exponent + n_digits;
+        normalized_len = n_digits if left_digits > 0 else 1 - left_digits + n_digits;
+        minus_signs = is_negative;
+        ends_with_zero = False;
+    else:                                                # scientific notation, e.g. "1E+2" or "1.5E-7"
+        exponent_str = str(abs(adjusted));
+        normalized_len = n_digits + 1 + len(exponent_str) + (adjusted >= 0);
+        minus_signs = is_negative + (adjusted < 0);
+        ends_with_zero = exponent_str.endswith('0');
+
+    if '.' in number_str and not ends_with_zero and number_str.endswith('0'):
+        # Count explicit trailing zeros after the decimal point
+        trailing_zeros = len(number_str) - len(number_str.rstrip('0'));
+        return normalized_len + minus_signs + trailing_zeros;
+    return normalized_len;
+
+def open_sheet_readonly(path : str, 
+                        sheet_name : str | None = None) -> ReadOnlyWorksheet:
+    """
+    Opens a workbook in read-only mode and returns one of its sheets, for fast searching and extraction.
+
+    Read-only sheets are streamed from the file with lightweight cells, which makes 'search_excl_val' and 
+    'get_excl_sheet_vals' much faster on large sheets. Both return the same results as for a normal sheet, 
+    ranges past the last data row/ column are padded with None by 'get_excl_sheet_vals'.
+    Cell values are read as cached results ('data_only').
+    The workbook keeps the file open, call 'sheet.parent.close()' when done.
+
+    Args:
+        path = Path to the excel workbook
+        sheet_name = Name of the sheet to return, the active sheet is returned if not given
+
+    Returns:
+        openpyxl read-only sheet object
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True);
+    return workbook[sheet_name] if sheet_name else workbook.active;
+
+def coords_as_a1(hits : dict) -> list[str]:
+    """
+    Converts the 'Row' and 'Column' entries of a 'search_excl_val' result into excel 'A3' standard coordinates.
+
+    Args:
+        hits = dict with parallel 'Row' and 'Column' integer arrays (or lists)
+
+    Returns:
+        A list of cell coordinates, e.g. ['A3', 'AA10']
+    """
+    col_letters = numpy.vectorize(get_column_letter, otypes=[str])(numpy.asarray(hits['Column'], dtype=numpy.int32));
+    return numpy.char.add(col_letters, numpy.asarray(hits['Row'], dtype=numpy.int32).astype(str)).tolist();
+
+def _hits_as_dict(*hit_dicts) -> dict:
+    """
+    Joins row/ column/ value hit collections, in order, into a single 'search_excl_val' result dict.
+    'Row' and 'Column' are parallel int32 arrays, 'Coordinate' and 'Value' are lists.
+    """
+    result = {'Row' : numpy.concatenate([numpy.asarray(hits['Row'], dtype=numpy.int32) for hits in hit_dicts]), 
+              'Column' : numpy.concatenate([numpy.asarray(hits['Column'], dtype=numpy.int32) for hits in hit_dicts])};
+    result['Coordinate'] = coords_as_a1(result);
+    result['Value'] = [val_i for hits in hit_dicts for val_i in hits['Value']];
+    return result;
+
+class SheetIndex:
+    """
+    Index of a sheet's values, built with a single walk, for running many 'search_excl_val' calls against the same sheet.
+
+    Pass it to 'search_excl_val' in place of the sheet: the sheet is not walked again, and direct hits for 
+    'return_first_hit' become dict lookups. The index is not updated when the sheet is edited, build a new one.
+
+    Args:
+        sheet = openpyxl sheet object to index
+    """
+    def __init__(self, sheet : Worksheet | ReadOnlyWorksheet):
+        self.cells = [];                        # (row, column, value) of every non-empty cell, in sheet order
+        self.exact = defaultdict(list);         # str/ date/ time value -> its (row, column, value) cells, in sheet order
+        for r_i, row_ii in enumerate(sheet.iter_rows(values_only=True), start=1):
+            for c_ii, val_iii in enumerate(row_ii, start=1):
+                if val_iii is None:
+                    continue;
+                cell_i = (r_i, c_ii, val_iii);
+                self.cells.append(cell_i);
+                # only the types with direct-hit lookups are hashed, other values (e.g. rich text) may be unhashable
+                if isinstance(val_iii, (str, datetime.date, datetime.time)):
+                    self.exact[val_iii].append(cell_i);
+
+def _iter_cells(sheet : Worksheet | ReadOnlyWorksheet | SheetIndex):
+    """
+    Lazily yields (row, column, value) for every non-empty cell, in sheet order.
+    A 'SheetIndex' yields its stored cells instead of walking the sheet again.
+    """
+    if isinstance(sheet, SheetIndex):
+        yield from sheet.cells;
+        return;
+    for r_i, row_ii in enumerate(sheet.iter_rows(values_only=True), start=1):
+        for c_ii, val_iii in enumerate(row_ii, start=1):
+            if val_iii is not None:
+                yield r_i, c_ii, val_iii;
+
+def _iter_hits(sheet : Worksheet | ReadOnlyWorksheet | SheetIndex, 
+               target_ranks : dict, 
+               cell_types : tuple, 
+               excl_types : tuple = ()):
+    """
+    Lazily walks the sheet once and yields (rank, coordinate, value) for every cell equal to a search target.
+    A 'SheetIndex' only looks up the cells of each target, highest priority target first.
+
+    Args:
+        sheet = openpyxl sheet object or 'SheetIndex' to search through
+        target_ranks = dict of search target -> priority, 0 being the highest
+        cell_types = only cells of these types are compared
+        excl_types = cells of these types are skipped, even when they are an instance of 'cell_types'
+    """
+    if isinstance(sheet, SheetIndex):
+        cells = (cell_i for search_val_i in sorted(target_ranks, key=target_ranks.get) for cell_i in sheet.exact.get(search_val_i, ()));
+    else:
+        cells = _iter_cells(sheet);
+    for r_i, c_ii, val_iii in cells:
+        if not isinstance(val_iii, cell_types) or isinstance(val_iii, excl_types):
+            continue;
+        rank_i = target_ranks.get(val_iii);
+        if rank_i is not None:
+            yield rank_i, f"{get_column_letter(c_ii)}{r_i}", val_iii;
+
+def _iter_number_hits(sheet : Worksheet | ReadOnlyWorksheet | SheetIndex, 
+                      search_targets):
+    """
+    Lazily walks the sheet once and yields (rank, coordinate, value) for every numeric cell that rounds to a search target,
+    with the rank of the highest priority target it equals (0 being the highest).
+    Both sides are rounded with numpy.round to the significant digits of the target, as in 'search_excl_val'.
+    """
+    rounded_targets = [];       # (rank, digits, rounded target), rounded once instead of per cell
+    for rank_i, search_val_i in enumerate(search_targets):
+        round_of_number = count_significant_digits(str(search_val_i));
+        rounded_targets.append((rank_i, round_of_number, numpy.round(search_val_i, round_of_number)));
+    for r_i, c_ii, val_iii in _iter_cells(sheet):
+        if not isinstance(val_iii, numbers.Number):
+            continue;
+        val_f = float(val_iii);
+        for rank_i, round_of_number, rounded_target in rounded_targets:
+            if numpy.round(val_f, round_of_number) == rounded_target:
+                yield rank_i, f"{get_column_letter(c_ii)}{r_i}", val_iii;
+                break;
+
+def _target_ranks(search_targets) -> dict:
+    """
+    Maps each (hashable) search target to its position, so direct hits become a single dict lookup per cell.
+    The first occurrence of a target decides its priority for return_first_hit.
+    """
+    target_ranks = {};
+    for rank_i, search_val_i in enumerate(search_targets):
+        target_ranks.setdefault(search_val_i, rank_i);
+    return target_ranks;
+
+def _first_hit(hits) -> tuple:
+    """
+    Consumes '_iter_hits' until a hit on the highest priority target, and returns the best (coordinate, value) seen.
+    Returns (None, None) if there are no hits.
+    """
+    best_rank, best_hit = None, (None, None);
+    for rank_i, coord_i, val_i in hits:
+        if best_rank is None or rank_i < best_rank:
+            best_rank, best_hit = rank_i, (coord_i, val_i);
+            if rank_i == 0:
+                break;      # nothing can beat the first target, stop walking the sheet
+    return best_hit;
+
+def _equal_mask(search_targets, cell_vals : list) -> numpy.ndarray:
+    """
+    (targets x cells) mask of the cells equal to each search target, for hashable targets (str, date, time).
+    Each cell value is looked up once, instead of being compared against every target.
+    """
+    target_ids = {};
+    for search_val_i in search_targets:
+        target_ids.setdefault(search_val_i, len(target_ids));
+    cell_ids = numpy.array([target_ids.get(val_i, -1) for val_i in cell_vals], dtype=numpy.int64);
+    return numpy.array([target_ids[search_val_i] for search_val_i in search_targets], dtype=numpy.int64)[:, None] == cell_ids[None, :];
+
+def _mask_hits(hits : numpy.ndarray, 
+               cell_rows : list, 
+               cell_cols : list, 
+               cell_vals : list) -> tuple[dict, dict]:
+    """
+    Splits a (targets x cells) hit mask into the equal and the non-equal row/ column/ value hit collections.
+    There is one entry per (target, cell) pair: a cell is listed once per target it equals, and once per target it does not.
+    argwhere is row-major, so entries stay grouped by search target, in sheet order within each target.
+    """
+    equal_idx = numpy.argwhere(hits)[:, 1];
+    other_idx = numpy.argwhere(~hits)[:, 1];
+    cell_rows = numpy.array(cell_rows, dtype=numpy.int32);
+    cell_cols = numpy.array(cell_cols, dtype=numpy.int32);
+    equal_hits = {'Row' : cell_rows[equal_idx], 'Column' : cell_cols[equal_idx], 
+                  'Value' : [cell_vals[v_i] for v_i in equal_idx]};
+    other_hits = {'Row' : cell_rows[other_idx], 'Column' : cell_cols[other_idx], 
+                  'Value' : [cell_vals[v_i] for v_i in other_idx]};
+    return equal_hits, other_hits;
+
+def search_excl_val(sheet : Worksheet | ReadOnlyWorksheet | SheetIndex, 
                     search_targets, 
                     threshold : float = 0.8,
                     return_first_hit : bool = True,
-                    return_all_vals : bool = False):
+                    return_all_vals : bool = False, 
+                    scorer = None):
     """
     Search through an excel worksheet to find coordinates equal to search val
 
     Args:
-        sheet = openpyxl sheet object to search through
+        sheet = openpyxl sheet object to search through, a read-only sheet (see 'open_sheet_readonly') is much faster on large sheets.
+                A 'SheetIndex' of the sheet avoids walking it again when searching the same sheet many times.
         search_targets = iterable to search through. If the first value ( in position '0') is not a hit, continue through next iterable. Iterables need to be of same data type.
         threshold = Similarity threshold to search through
         return_first_hit = Return coordinate of first wxcwl cell equal to select value
+        scorer = Optional rapidfuzz-style scorer for the string similarity, see 'is_similar'
     Return:
-        A list of cell coordinates in excel 'A3' standard.
+        The (coordinate, value) of the first hit when 'return_first_hit' is set, otherwise a dict of hits with
+        'Coordinate' (excel 'A3' standard) and 'Value' lists, plus parallel int32 'Row' and 'Column' arrays.
+        Numeric searches without 'return_all_vals' return only the list of coordinates.
     """
 
-    import numbers
-    import datetime
-    from numpy import round, str_
-    
     # Error handling: check if sheet is of correct data-type
-    if not isinstance(sheet, Worksheet):   
-        raise TypeError(f"Incorrect variable type given for sheet '{sheet}' - {type(sheet)}, expected {type(Worksheet)}")
+    if not isinstance(sheet, (Worksheet, ReadOnlyWorksheet, SheetIndex)):   
+        raise TypeError(f"Incorrect variable type given for sheet '{sheet}' - {type(sheet)}, expected {Worksheet}, {ReadOnlyWorksheet} or {SheetIndex}")
 
      # Error handling: check if check if search targets are all the same data typee
     search_type = type(search_targets[0])                              
     if not all(isinstance(target_i, search_type) for target_i in search_targets): 
         raise TypeError(f"Search targets not same data type : {search_targets}")
     
-    similar_target_hits = {'Coordinate' : [], 'Value' : [] };
-    equal_targets = {'Coordinate' : [], 'Value' : []};
-    
+    similar_target_hits = {'Row' : [], 'Column' : [], 'Value' : []};
+    # bind the append methods once, the cell loops call them directly
+    similar_row_append, similar_col_append, similar_val_append = similar_target_hits['Row'].append, similar_target_hits['Column'].append, similar_target_hits['Value'].append;
+
     # Case 1: str val
-    if (search_type is str) or (search_type is str_):
-        for search_val_i in search_targets:
-            for row_ii in sheet.iter_rows(values_only=False):
-                for cell_iii in row_ii:
-                    if (cell_iii.value is None or isinstance(cell_iii.value, numbers.Number) or isinstance(cell_iii.value, datetime.time) or isinstance(cell_iii.value, datetime.datetime)):
-                        continue;
-                    if (cell_iii.value == search_val_i):
-                        if return_first_hit:
-                            return cell_iii.coordinate, cell_iii.value;
-                        equal_targets['Coordinate'].append(cell_iii.coordinate);
-                        equal_targets['Value'].append(cell_iii.value);
-                        
-                    try:
-                        if is_similar(search_val_i, str(cell_iii.value), threshold=threshold):
-                            similar_target_hits['Coordinate'].append(cell_iii.coordinate);
-                            similar_target_hits['Value'].append(cell_iii.value); 
-                    except SyntaxError:
-                        continue;    
+    if (search_type is str) or (search_type is numpy.str_):
+        if return_first_hit:
+            first_hit = _first_hit(_iter_hits(sheet, _target_ranks(search_targets), (str,)));
+            if first_hit[0] is not None:
+                return first_hit;
+            if not return_all_vals:
+                return (None, None); # return nothing if there are no results 
+
+        cell_rows, cell_cols, cell_vals = [], [], [];            # text cells, for the direct hits and the fuzzy pass
+        for r_i, c_ii, val_iii in _iter_cells(sheet):      # walk the sheet once, raw values only
+            if (isinstance(val_iii, numbers.Number) or isinstance(val_iii, datetime.time) or isinstance(val_iii, datetime.datetime)):
+                continue;
+            cell_rows.append(r_i);
+            cell_cols.append(c_ii);
+            cell_vals.append(val_iii);
+        # direct hits, one entry per (target, cell) pair as in the other searches.
+        # Only str cells can equal a str target, others may be unhashable (rich text)
+        equal_mask = _equal_mask(search_targets, [val_i if isinstance(val_i, str) else None for val_i in cell_vals]);
+        equal_targets, _ = _mask_hits(equal_mask, cell_rows, cell_cols, cell_vals);
         if return_all_vals:
-            return {'Coordinate' : equal_targets['Coordinate'] + similar_target_hits['Coordinate'], 
-                   'Value' : equal_targets['Value'] + similar_target_hits['Value']};
-        if equal_targets['Coordinate']:  # check if equal hits are on;
-            return equal_targets;    
+            # similar hits are only returned with return_all_vals, score all (target, cell) pairs in one matrix
+            targets_str = [str(search_val_i).strip() for search_val_i in search_targets];
+            vals_str = [str(val_i).strip() for val_i in cell_vals];
+            if process is not None:
+                scale = _scorer_scale(scorer);
+                scores = process.cdist(targets_str, vals_str, scorer=fuzz.ratio if scorer is None else scorer, workers=-1, 
+                                       dtype=numpy.float64) / scale;      # thresholded below, see 'is_similar'
+            else:
+                scores = numpy.array([[_pair_ratio(t_i, v_i, threshold, scorer) for v_i in vals_str] for t_i in targets_str], dtype=numpy.float64);
+            for _, v_i in numpy.argwhere(scores >= threshold):         # row-major, so hits stay grouped by search target
+                similar_row_append(cell_rows[v_i]);
+                similar_col_append(cell_cols[v_i]);
+                similar_val_append(cell_vals[v_i]);
+            return _hits_as_dict(equal_targets, similar_target_hits);
+        if equal_targets['Value']:  # check if equal hits are on;
+            return _hits_as_dict(equal_targets);    
         return (None, None); # return nothing if there are no results 
 
 
     
     # Case 2: number
     elif isinstance(search_targets[0], numbers.Number):    
-        for search_val_i in search_targets:    
+        if return_first_hit:
+            first_hit = _first_hit(_iter_number_hits(sheet, search_targets));     # stops at the first hit on the first target
+            if first_hit[0] is not None:
+                return first_hit;
+            if not return_all_vals:
+                return (None, None);
+
+        cell_rows, cell_cols, cell_vals = [], [], [];
+        for r_i, c_ii, val_iii in _iter_cells(sheet):      # bulk read the numeric cells
+            if not isinstance(val_iii, numbers.Number):
+                continue; # skip redundant values
+            cell_rows.append(r_i);
+            cell_cols.append(c_ii);
+            cell_vals.append(val_iii);
+
+        # compare all cells against each target in one vectorised round, hits is a (targets x cells) mask
+        vals = numpy.array(cell_vals, dtype=numpy.float64);
+        hits = numpy.zeros((len(search_targets), vals.size), dtype=bool);
+        for rank_i, search_val_i in enumerate(search_targets):
             round_of_number = count_significant_digits(str(search_val_i));       # calculate signifigant figures, value needs to be string
-            for row_ii in sheet.iter_rows(values_only=False):
-                for cell_iii in row_ii:
-                    if not isinstance(cell_iii.value, numbers.Number):
-                        continue; # skip redundant values
-                    if (round(cell_iii.value, round_of_number) == round(search_val_i, round_of_number)):
-                        if return_first_hit:
-                            return cell_iii.coordinate, cell_iii.value
-                        equal_targets['Coordinate'].append(cell_iii.coordinate);
-                        equal_targets['Value'].append(cell_iii.value); 
-                    else:
-                        similar_target_hits['Coordinate'].append(cell_iii.coordinate);
-                        similar_target_hits['Value'].append(cell_iii.value);
+            # numpy.round on both sides, as the original per-cell check did: builtin round treats half-way values
+            # differently (round(2.675, 2) -> 2.67, numpy.round(2.675, 2) -> 2.68)
+            hits[rank_i] = numpy.round(vals, round_of_number) == numpy.round(search_val_i, round_of_number);
+
+        equal_targets, similar_target_hits = _mask_hits(hits, cell_rows, cell_cols, cell_vals);   # one entry per (target, cell) pair
 
         if return_all_vals:
-            return {'Coordinate' : equal_targets['Coordinate'] + similar_target_hits['Coordinate'], 
-                   'Value' : equal_targets['Value'] + similar_target_hits['Value']};
+            return _hits_as_dict(equal_targets, similar_target_hits);
         elif equal_targets['Value']:
-            return equal_targets['Coordinate'];
+            return coords_as_a1(equal_targets);
         else:
             return (None, None);
 
     
     # Case 3: date or datetime
     elif (search_type is datetime.date) or (search_type is datetime.datetime):
-        for search_val_i in search_targets:
-            for row_ii in sheet.iter_rows(values_only=False):
-                for cell_iii in row_ii:
-                    if not isinstance(cell_iii.value, datetime.datetime) and not isinstance(cell_iii.value, datetime.date):
-                        continue;
-                    elif (cell_iii.value == search_val_i):  # check wether we find a direct hit;
-                        if return_first_hit:
-                            return cell_iii.coordinate, cell_iii.value
-                        equal_targets['Coordinate'].append(cell_iii.coordinate);
-                        equal_targets['Value'].append(cell_iii.value);  
-                    else:
-                        similar_target_hits['Value'].append(cell_iii.value);
-                        similar_target_hits['Coordinate'].append(cell_iii.coordinate);
+        if return_first_hit:
+            first_hit = _first_hit(_iter_hits(sheet, _target_ranks(search_targets), (datetime.datetime, datetime.date)));
+            if first_hit[0] is not None:
+                return first_hit;
+            if not return_all_vals:
+                return (None, None);
+
+        cell_rows, cell_cols, cell_vals = [], [], [];
+        for r_i, c_ii, val_iii in _iter_cells(sheet):
+            if not isinstance(val_iii, datetime.datetime) and not isinstance(val_iii, datetime.date):
+                continue;
+            cell_rows.append(r_i);
+            cell_cols.append(c_ii);
+            cell_vals.append(val_iii);
+        # check wether we find a direct hit, one entry per (target, cell) pair as in the numeric search
+        equal_targets, similar_target_hits = _mask_hits(_equal_mask(search_targets, cell_vals), cell_rows, cell_cols, cell_vals);
 
         if return_all_vals:
-            return {'Coordinate' : equal_targets['Coordinate'] + similar_target_hits['Coordinate'], 
-                   'Value' : equal_targets['Value'] + similar_target_hits['Value']};
+            return _hits_as_dict(equal_targets, similar_target_hits);
         elif equal_targets['Value']:
-            return equal_targets;
+            return _hits_as_dict(equal_targets);
         else:
             return (None, None);
                 
     elif (search_type is datetime.time):
-        for search_val_i in search_targets:
-            for row_ii in sheet.iter_rows(values_only=True):
-                for cell_iii in row_ii:
-                    if not isinstance(cell_iii.value, datetime.time):
-                        continue;
-                    if (cell_iii.value == search_val_i):
-                        if return_first_hit:
-                            return cell_iii.coordinate, cell_iii.value;
-                        equal_targets['Coordinate'].append(cell_iii.coordinate);
-                        equal_targets['Value'].append(cell_iii.value);  
-                    else:
-                        similar_target_hits['Value'].append(cell_iii.value);
-                        similar_target_hits['Coordinate'].append(cell_iii.coordinate);
+        if return_first_hit:
+            first_hit = _first_hit(_iter_hits(sheet, _target_ranks(search_targets), (datetime.time,)));
+            if first_hit[0] is not None:
+                return first_hit;
+            if not return_all_vals:
+                return None;        # no direct hit, nothing is returned for time values
+
+        cell_rows, cell_cols, cell_vals = [], [], [];
+        for r_i, c_ii, val_iii in _iter_cells(sheet):
+            if not isinstance(val_iii, datetime.time):
+                continue;
+            cell_rows.append(r_i);
+            cell_cols.append(c_ii);
+            cell_vals.append(val_iii);
+        equal_targets, similar_target_hits = _mask_hits(_equal_mask(search_targets, cell_vals), cell_rows, cell_cols, cell_vals);
         if equal_targets['Value'] and not return_all_vals:
-            return equal_targets, None;     
+            return _hits_as_dict(equal_targets), None;     
         elif return_all_vals:
-            return {'Coordinate' : equal_targets['Coordinate'] + similar_target_hits['Coordinate'], 
-                   'Value' : equal_targets['Value'] + similar_target_hits['Value']};
+            return _hits_as_dict(equal_targets, similar_target_hits);
                     
     else:
         raise ValueError(f"Variable search_targets data type unknown : {search_type}, expected str, int, float, datetime.date, datetime.datetime")
@@ -333,13 +678,17 @@ def search_excl_val(sheet : Worksheet,
 
 
 
-def get_excl_sheet_vals(sheet : Worksheet, 
+def get_excl_sheet_vals(sheet : Worksheet | ReadOnlyWorksheet, 
                        start_Cord : tuple[int,int] | str, 
                        end_Cord :   tuple[int,int] | str):
     """
     Takes a given excel sheet and extracts, and returns the values from the start and end coordinates in a 2D array.
+    Both the start and end coordinates are inclusive.
+
+    For large ranges, open the sheet with 'open_sheet_readonly' to stream it with constant memory.
+    Read-only sheets stop at their last data row/ column, the range is padded with None so the 
+    returned array has the same shape for either sheet type.
     """
-    from numpy import array
     # Test data type for start values, ensure the data type is either str or tuple[in,int]
     if isinstance(start_Cord, str):
         row_start, col_start = exc_coord_to_rc(start_Cord);
@@ -368,12 +717,20 @@ def get_excl_sheet_vals(sheet : Worksheet,
         col_end = col_start;
         col_start = buffer_val;
     
-    values_extracted = [];
-    
-    
-    for r_i in range(row_start, row_end+1):
-        values_extracted.append(array([sheet.cell(row=r_i, column = c_ii).value for c_ii in range(col_start, col_end+1)]));
+    # stream raw values for the whole range, no Cell objects are created
+    n_rows, n_cols = row_end - row_start + 1, col_end - col_start + 1;
+    rows_extracted = [];
+    for row_i in sheet.iter_rows(min_row=row_start, max_row=row_end, 
+                                 min_col=col_start, max_col=col_end, 
+                                 values_only=True):
+        rows_extracted.append(tuple(row_i) + (None,) * (n_cols - len(row_i)));   # read-only sheets stop at the last data column
+    rows_extracted.extend([(None,) * n_cols] * (n_rows - len(rows_extracted)));    # ... and at the last data row
+
+    # let numpy infer the dtype (e.g. float64 for numeric ranges), but keep mixed strings and numbers as objects
+    values_extracted = numpy.array(rows_extracted);
+    if values_extracted.dtype.kind == 'U' and not all(isinstance(val_i, str) for row_i in rows_extracted for val_i in row_i):
+        values_extracted = numpy.array(rows_extracted, dtype=object);
     
     if (row_start == row_end) or (col_start == col_end):
-        return array(values_extracted).ravel()
-    return array(values_extracted);       
\ No newline at end of file
+        return values_extracted.ravel()
+    return values_extracted;       
\ No newline at end of file